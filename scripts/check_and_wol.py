@@ -5,26 +5,40 @@
 保存された予約情報キャッシュから予約をチェックし、
 条件に合致した場合WOLパケットを送信します
 
-実行: cron定期実行（常時実行）
+実行: cron定期実行（常時実行）、または --daemon で常駐実行
 タイミング: 25-30分前と0-5分前に検出したら送信
 """
 
 import json
+import math
 import os
+import signal
 import sys
 import subprocess
+import threading
+import time
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(__file__))
+from utils.boot_latency import BootLatencyTracker
+from utils.cache_sync import CacheSyncServer, apply_reserve_diff
+from utils.history import append_record, create_history, elapsed_ms, new_record
 from utils.logger import Logger
 from utils.pc_monitor import PCMonitor
+from utils.status_server import StatusServer
+
+# 送信タイミングの許容範囲（分）: 第1は -5～+2分、第2は ±2分
+FIRST_WINDOW_BEFORE = 5
+FIRST_WINDOW_AFTER = 2
+SECOND_WINDOW = 2
 
 
 class WOLChecker:
     """WOL送信判定・実行クラス"""
 
-    def __init__(self, config_path, cache_path, log_dir):
+    def __init__(self, config_path, cache_path, log_dir, clock=None, pc_monitor=None, wol_sender=None):
         """
         初期化
 
@@ -32,14 +46,69 @@ class WOLChecker:
             config_path: 設定ファイルパス
             cache_path: キャッシュファイルパス
             log_dir: ログディレクトリ
+            clock: 現在時刻を返す関数（省略時は datetime.now、シミュレーション用）
+            pc_monitor: PC状態監視オブジェクト（省略時は PCMonitor、シミュレーション用）
+            wol_sender: MACアドレスを受け取りWOL送信結果を返す関数（省略時は send_wol.py を実行）
         """
         self.config = self._load_config(config_path)
         self.cache_path = cache_path
         self.logger = Logger(log_dir, "wol", level="INFO")
+        self.history = create_history(self.config, log_dir, "wol")
+        self.clock = clock or datetime.now
+        self.boot_latency = self._create_boot_latency_tracker()
 
-        self.pc_monitor = PCMonitor(
+        self.pc_monitor = pc_monitor or PCMonitor(
             self.config["desktop_pc"]["ip_address"],
-            self.config["monitoring"]["pc_check_timeout"]
+            self.config["monitoring"]["pc_check_timeout"],
+            mac_address=self.config["desktop_pc"]["mac_address"],
+            neighbor_fallback=self.config["monitoring"].get("neighbor_fallback", "ping")
+        )
+        self.wol_sender = wol_sender or self._run_send_wol_script
+
+        # 常駐実行時のメモリ上キャッシュ
+        self.resident = False
+        self._cache_data = None
+        self._cache_mtime = None
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+        # 状態取得用（常駐実行時のみ更新）
+        self.counters = {
+            "checks": 0,
+            "wol_sent": 0,
+            "wol_failed": 0,
+            "errors": 0,
+            "cache_reloads": 0,
+            "diffs_applied": 0,
+            "diffs_failed": 0
+        }
+        self.last_check = None
+        self._wake_deadlines = ([], [])
+        self._status_body = None
+        self._status_built_at = 0.0
+
+    def _create_boot_latency_tracker(self):
+        """
+        起動所要時間トラッカーを生成
+
+        Returns:
+            BootLatencyTracker: トラッカー、適応タイミングが無効の場合はNone
+        """
+        adaptive = self.config["wol_timing"].get("adaptive", {})
+        if not adaptive.get("enabled", False):
+            return None
+
+        state_path = adaptive.get(
+            "state_path",
+            os.path.join(os.path.dirname(self.cache_path), "boot_latency.json")
+        )
+        return BootLatencyTracker(
+            os.path.expanduser(state_path),
+            percentile=adaptive.get("percentile", 90),
+            window=adaptive.get("window", 20),
+            min_samples=adaptive.get("min_samples", 3),
+            max_pending_minutes=adaptive.get("max_pending_minutes", 60)
         )
 
     def _load_config(self, config_path):
@@ -61,6 +130,32 @@ class WOLChecker:
         Returns:
             bool: 処理成功ならTrue
         """
+        record = new_record()
+        started = time.monotonic()
+        result = False
+
+        try:
+            result = self._check_and_send(record)
+            return result
+        finally:
+            record["durations_ms"]["total"] = elapsed_ms(started)
+            record["result"] = result
+            append_record(self.history, record, self.logger)
+            if self.resident:
+                self._update_status(record)
+
+    def _check_and_send(self, record):
+        """
+        予約チェック・WOL送信の本体
+
+        Args:
+            record: 実行履歴レコード（処理結果を書き込む）
+
+        Returns:
+            bool: 処理成功ならTrue
+        """
+        durations = record["durations_ms"]
+
         try:
             self.logger.info("WOL送信チェック処理開始")
 
@@ -68,52 +163,367 @@ class WOLChecker:
             pc_check_method = self.config["monitoring"]["pc_check_method"]
             self.logger.info(f"PC起動確認開始（方法: {pc_check_method}）")
 
-            if self.pc_monitor.is_pc_alive(pc_check_method):
+            phase_started = time.monotonic()
+            pc_alive = self.pc_monitor.is_pc_alive(pc_check_method)
+            durations["probe"] = elapsed_ms(phase_started)
+            record["pc_alive"] = pc_alive
+            self._record_boot_latency(pc_alive)
+
+            if pc_alive:
                 self.logger.info("PCが起動中のため、WOL送信をスキップ")
+                record["status"] = "pc_alive"
                 return True
 
             self.logger.info("PCが起動していません")
 
             # キャッシュから予約情報を読み込み
             self.logger.info(f"キャッシュファイル読み込み開始: {self.cache_path}")
-            cache_data = self._load_cache()
+            phase_started = time.monotonic()
+            cache_data = self._get_cache()
+            durations["cache_load"] = elapsed_ms(phase_started)
             if not cache_data:
                 self.logger.warning("キャッシュが見つかりません")
+                record["status"] = "no_cache"
                 return False
 
             self.logger.info("キャッシュ読み込み成功")
+            record["reserve_count"] = len(cache_data.get("reserves", []))
 
             # キャッシュの鮮度をチェック
             self.logger.info("キャッシュ鮮度チェック開始")
             if not self._check_cache_freshness(cache_data):
                 self.logger.warning("キャッシュが古すぎます")
+                record["status"] = "stale_cache"
+                # 送信すべき予約があったかを実行履歴に残す（WOL送信はしない）
+                with self._lock:
+                    due_reserve, _ = self._find_reserve_to_send(cache_data["reserves"])
+                if due_reserve:
+                    self.logger.warning(f"キャッシュが古いため送信しません: {due_reserve.get('program_name', '不明')}")
+                    record["reserve_id"] = due_reserve.get("id")
                 return False
 
             self.logger.info("キャッシュは最新です")
 
             # 予約情報から条件に合致するものを検索
             self.logger.info(f"予約検索開始（保存済み予約数: {len(cache_data['reserves'])}件）")
-            reserve_to_send = self._find_reserve_to_send(cache_data["reserves"])
+            phase_started = time.monotonic()
+            with self._lock:
+                reserve_to_send, timing = self._find_reserve_to_send(cache_data["reserves"])
+            durations["find"] = elapsed_ms(phase_started)
 
             if reserve_to_send:
                 self.logger.info(f"予約検出: {reserve_to_send['program_name']} (開始時刻: {reserve_to_send['start_time']})")
+                record["reserve_id"] = reserve_to_send.get("id")
                 self.logger.info("WOL送信実行")
-                result = self._send_wol(cache_data)
+                phase_started = time.monotonic()
+                result = self._send_wol(cache_data, timing)
+                durations["send"] = elapsed_ms(phase_started)
+                record["wol_sent"] = result
                 if result:
+                    if self.boot_latency is not None:
+                        self.boot_latency.record_wol_sent(self.config["desktop_pc"]["mac_address"], self.clock())
                     self.logger.info("WOL送信処理完了（成功）")
+                    record["status"] = "sent"
                 else:
                     self.logger.error("WOL送信処理完了（失敗）")
+                    record["status"] = "send_failed"
                 return result
             else:
                 self.logger.info("送信対象の予約なし")
+                record["status"] = "no_target"
                 return True
 
         except Exception as e:
             import traceback
             self.logger.error(f"WOL送信チェック中にエラー: {e}")
             self.logger.error(f"スタックトレース:\n{traceback.format_exc()}")
+            record["status"] = "error"
             return False
 
+    def _record_boot_latency(self, pc_alive):
+        """
+        PC起動確認結果から起動所要時間を計測
+
+        Args:
+            pc_alive: PC起動中ならTrue
+        """
+        if self.boot_latency is None:
+            return
+
+        try:
+            host = self.config["desktop_pc"]["mac_address"]
+            sample = self.boot_latency.record_probe(host, pc_alive, self.clock())
+            if sample is not None:
+                self.logger.info(f"起動所要時間を計測: {sample:.0f}秒 (推定値: {self.boot_latency.estimate(host)}秒)")
+                if self.resident:
+                    # 第1タイミングが変わる可能性があるためWOL送信予定を作り直す
+                    with self._lock:
+                        self._index_wake_deadlines(self._cache_data)
+        except Exception as e:
+            self.logger.warning(f"起動所要時間の記録に失敗: {e}")
+
+    def _first_minutes(self):
+        """
+        第1タイミング（分前）を決定
+
+        適応タイミングが有効で計測が十分な場合は「推定起動所要時間 + 安全マージン」を使う。
+        設定値 wol_timing.first_minutes を上限とし、第1・第2タイミングの許容範囲が
+        重ならないよう second_minutes + 7分 を下限とする
+
+        Returns:
+            int: 第1タイミング（分前）
+        """
+        timing = self.config["wol_timing"]
+        configured = timing["first_minutes"]
+        if self.boot_latency is None:
+            return configured
+
+        estimate = self.boot_latency.estimate(self.config["desktop_pc"]["mac_address"])
+        if estimate is None:
+            return configured
+
+        margin_minutes = timing.get("adaptive", {}).get("margin_minutes", 10)
+        lead_minutes = math.ceil(estimate / 60 + margin_minutes)
+        lower_bound = timing["second_minutes"] + SECOND_WINDOW + FIRST_WINDOW_BEFORE
+        return min(configured, max(lower_bound, lead_minutes))
+
+    def run_forever(self, interval_seconds=60):
+        """
+        常駐してWOL送信チェックを繰り返し実行
+
+        キャッシュはメモリ上に保持し、ファイルが更新された場合のみ再読み込みする。
+        daemon.sync_socket が設定されている場合は update_cache.py からの差分を受信し、
+        受信後すぐにチェックを実行する
+
+        Args:
+            interval_seconds: チェック間隔（秒）
+        """
+        self.resident = True
+        sync_server = None
+
+        socket_path = self.config.get("daemon", {}).get("sync_socket")
+        if socket_path:
+            sync_server = CacheSyncServer(os.path.expanduser(socket_path), self.apply_cache_diff)
+            try:
+                sync_server.start()
+                self.logger.info(f"キャッシュ差分の受信開始: {sync_server.socket_path}")
+            except OSError as e:
+                # 差分を受信できなくてもファイル経由でキャッシュは反映される
+                self.logger.warning(f"キャッシュ差分の受信を開始できません: {e}")
+                sync_server = None
+
+        status_server = None
+        status_config = self.config.get("daemon", {}).get("status")
+        if status_config:
+            status_server = StatusServer(
+                status_config.get("host", "127.0.0.1"),
+                status_config.get("port", 8765),
+                self.status_body
+            )
+            try:
+                status_server.start()
+                self.logger.info(f"状態取得サーバー開始: http://{status_server.host}:{status_server.port}/status")
+            except OSError as e:
+                self.logger.warning(f"状態取得サーバーを開始できません: {e}")
+                status_server = None
+
+        self.logger.info(f"常駐実行開始（チェック間隔: {interval_seconds}秒）")
+
+        try:
+            while not self._stopping.is_set():
+                # PC起動確認・WOL送信中も差分を受信できるよう、ロックはキャッシュの参照・更新時のみ取得する
+                self.check_and_send()
+                # PC起動中はチェックでキャッシュを読まないため、更新の有無だけ確認しておく
+                self._get_cache()
+                self._wakeup.wait(interval_seconds)
+                self._wakeup.clear()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if sync_server is not None:
+                sync_server.stop()
+            if status_server is not None:
+                status_server.stop()
+            self.logger.info("常駐実行終了")
+
+    def stop(self):
+        """常駐実行を停止"""
+        self._stopping.set()
+        self._wakeup.set()
+
+    def apply_cache_diff(self, diff):
+        """
+        update_cache.py から受信した予約情報の差分をメモリ上のキャッシュに適用
+
+        Args:
+            diff: 予約情報の差分（added, removed, changed, last_updated）
+
+        Returns:
+            bool: 適用成功ならTrue
+        """
+        with self._lock:
+            if self._cache_data is None:
+                # メモリ上にキャッシュがなければファイルから読み込む（更新済みのため差分は反映済み）
+                applied = self._get_cache() is not None
+            else:
+                apply_reserve_diff(self._cache_data, diff)
+                self._cache_mtime = self._stat_cache_mtime()
+                self._index_wake_deadlines(self._cache_data)
+                applied = True
+            self.counters["diffs_applied" if applied else "diffs_failed"] += 1
+
+        self.logger.info(
+            f"キャッシュ差分を適用: 追加{len(diff.get('added', []))}件 / "
+            f"削除{len(diff.get('removed', []))}件 / 変更{len(diff.get('changed', []))}件"
+        )
+        self._wakeup.set()
+        return applied
+
+    def _get_cache(self):
+        """
+        キャッシュを取得
+
+        常駐実行時はメモリ上のキャッシュを返し、ファイルが更新された場合のみ再読み込みする
+
+        Returns:
+            dict: キャッシュデータ、読み込み失敗の場合はNone
+        """
+        if not self.resident:
+            return self._load_cache()
+
+        with self._lock:
+            mtime = self._stat_cache_mtime()
+            if self._cache_data is None or mtime != self._cache_mtime:
+                self._cache_data = self._load_cache()
+                self._cache_mtime = mtime
+                self._index_wake_deadlines(self._cache_data)
+                self.counters["cache_reloads"] += 1
+            else:
+                self.logger.debug("メモリ上のキャッシュを使用")
+            return self._cache_data
+
+    def _update_status(self, record):
+        """
+        チェック結果を状態取得用のカウンタに反映
+
+        Args:
+            record: 実行履歴レコード
+        """
+        self.counters["checks"] += 1
+        status = record["status"]
+        if status == "sent":
+            self.counters["wol_sent"] += 1
+        elif status == "send_failed":
+            self.counters["wol_failed"] += 1
+        elif status == "error":
+            self.counters["errors"] += 1
+
+        self.last_check = {
+            "at": self.clock().isoformat(timespec="seconds"),
+            "status": status,
+            "pc_alive": record["pc_alive"],
+            "probe_ms": record["durations_ms"].get("probe"),
+            "total_ms": record["durations_ms"].get("total")
+        }
+        self._status_body = None
+
+    def _index_wake_deadlines(self, cache_data):
+        """
+        WOL送信予定時刻の一覧を作成（キャッシュ変更時のみ）
+
+        Args:
+            cache_data: キャッシュデータ
+        """
+        deadlines = []
+        if cache_data:
+            first_minutes = self._first_minutes()
+            second_minutes = self.config["wol_timing"]["second_minutes"]
+            for reserve in cache_data.get("reserves", []):
+                try:
+                    start_time = datetime.fromisoformat(reserve["start_time"])
+                except (ValueError, KeyError):
+                    continue
+                for timing, minutes, sent_key in (
+                    ("first", first_minutes, "wol_sent_first"),
+                    ("second", second_minutes, "wol_sent_second")
+                ):
+                    if not reserve.get(sent_key, False):
+                        deadlines.append((
+                            start_time - timedelta(minutes=minutes),
+                            timing,
+                            reserve.get("id"),
+                            reserve.get("program_name"),
+                            reserve["start_time"]
+                        ))
+            deadlines.sort(key=lambda d: d[0])
+
+        # 二分探索用の時刻リストと一緒に差し替える
+        self._wake_deadlines = ([d[0] for d in deadlines], deadlines)
+        self._status_body = None
+
+    def status_body(self):
+        """
+        状態取得サーバーの応答本文
+
+        メモリ上の状態のみから作成し、作成結果は最大1秒間使い回す
+
+        Returns:
+            bytes: 状態（JSON）
+        """
+        body = self._status_body
+        if body is not None and time.monotonic() - self._status_built_at < 1.0:
+            return body
+
+        now = self.clock()
+        wake_times, deadlines = self._wake_deadlines
+        limit = self.config.get("daemon", {}).get("status", {}).get("next_wakes", 5)
+        start = bisect_left(wake_times, now)
+
+        cache_data = self._cache_data
+        cache_status = None
+        if cache_data and cache_data.get("last_updated"):
+            try:
+                age_hours = (now - datetime.fromisoformat(cache_data["last_updated"])).total_seconds() / 3600
+                max_age_hours = self.config["cache"]["max_age_hours"]
+                cache_status = {
+                    "last_updated": cache_data["last_updated"],
+                    "age_hours": round(age_hours, 2),
+                    "max_age_hours": max_age_hours,
+                    "fresh": age_hours <= max_age_hours,
+                    "reserve_count": len(cache_data.get("reserves", []))
+                }
+            except (ValueError, KeyError):
+                pass
+
+        status = {
+            "generated_at": now.isoformat(timespec="seconds"),
+            "next_wakes": [
+                {
+                    "wake_at": wake_at.isoformat(timespec="seconds"),
+                    "timing": timing,
+                    "reserve_id": reserve_id,
+                    "program_name": program_name,
+                    "start_time": start_time
+                }
+                for wake_at, timing, reserve_id, program_name, start_time in deadlines[start:start + limit]
+            ],
+            "cache": cache_status,
+            "last_check": self.last_check,
+            "counters": dict(self.counters)
+        }
+
+        body = json.dumps(status, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._status_body = body
+        self._status_built_at = time.monotonic()
+        return body
+
+    def _stat_cache_mtime(self):
+        """キャッシュファイルの更新時刻（存在しない場合はNone）"""
+        try:
+            return os.stat(self.cache_path).st_mtime_ns
+        except OSError:
+            return None
+
     def _load_cache(self):
         """
         キャッシュを読み込み
@@ -151,7 +561,7 @@ class WOLChecker:
         try:
             max_age_hours = self.config["cache"]["max_age_hours"]
             last_updated = datetime.fromisoformat(cache_data["last_updated"])
-            age = datetime.now() - last_updated
+            age = self.clock() - last_updated
             age_hours = age.total_seconds() / 3600
 
             self.logger.debug(f"キャッシュ最終更新: {last_updated.isoformat()}")
@@ -182,10 +592,10 @@ class WOLChecker:
             reserves: 予約情報リスト
 
         Returns:
-            dict: 送信対象の予約、ない場合はNone
+            tuple: (送信対象の予約, タイミング "first" or "second")、ない場合は (None, None)
         """
-        now = datetime.now()
-        first_minutes = self.config["wol_timing"]["first_minutes"]
+        now = self.clock()
+        first_minutes = self._first_minutes()
         second_minutes = self.config["wol_timing"]["second_minutes"]
 
         self.logger.debug(f"WOL送信タイミング設定: 第1={first_minutes}分前、第2={second_minutes}分前")
@@ -203,24 +613,24 @@ class WOLChecker:
                 )
 
                 # 第1タイミング: first_minutes分前（±2分範囲）
-                if (first_minutes - 5) <= time_until_start <= (first_minutes + 2):
+                if (first_minutes - FIRST_WINDOW_BEFORE) <= time_until_start <= (first_minutes + FIRST_WINDOW_AFTER):
                     if not reserve.get("wol_sent_first", False):
                         self.logger.info(
                             f"WOL送信対象検出（第1タイミング）: {program_name} "
                             f"({time_until_start:.1f}分前)"
                         )
-                        return reserve
+                        return reserve, "first"
                     else:
                         self.logger.debug(f"第1タイミングでの送信済み: {program_name}")
 
                 # 第2タイミング: second_minutes分前（±2分範囲）
-                if (second_minutes - 2) <= time_until_start <= (second_minutes + 2):
+                if (second_minutes - SECOND_WINDOW) <= time_until_start <= (second_minutes + SECOND_WINDOW):
                     if not reserve.get("wol_sent_second", False):
                         self.logger.info(
                             f"WOL送信対象検出（第2タイミング）: {program_name} "
                             f"({time_until_start:.1f}分前)"
                         )
-                        return reserve
+                        return reserve, "second"
                     else:
                         self.logger.debug(f"第2タイミングでの送信済み: {program_name}")
 
@@ -229,14 +639,15 @@ class WOLChecker:
                 continue
 
         self.logger.debug("WOL送信対象なし")
-        return None
+        return None, None
 
-    def _send_wol(self, cache_data):
+    def _send_wol(self, cache_data, timing):
         """
         WOLパケットを送信し、キャッシュを更新
 
         Args:
             cache_data: キャッシュデータ
+            timing: 送信のきっかけとなったタイミング（"first" or "second"）
 
         Returns:
             bool: 送信成功ならTrue
@@ -245,7 +656,31 @@ class WOLChecker:
             mac_address = self.config["desktop_pc"]["mac_address"]
             self.logger.info(f"WOLパケット送信開始 (MAC: {mac_address})")
 
-            # send_wol.pyを実行
+            if not self.wol_sender(mac_address):
+                return False
+
+            # キャッシュの送信済みフラグを更新
+            self.logger.info("キャッシュ更新開始")
+            self._mark_wol_sent(cache_data, timing)
+
+            self.logger.info(f"WOL送信完了成功 (MAC: {mac_address})")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"WOL送信エラー: {e}")
+            return False
+
+    def _run_send_wol_script(self, mac_address):
+        """
+        send_wol.py を実行してWOLパケットを送信
+
+        Args:
+            mac_address: MACアドレス
+
+        Returns:
+            bool: 送信成功ならTrue
+        """
+        try:
             send_wol_script = os.path.join(os.path.dirname(__file__), "send_wol.py")
             self.logger.debug(f"WOLスクリプト実行: {send_wol_script}")
 
@@ -263,73 +698,82 @@ class WOLChecker:
                 return False
 
             self.logger.debug("WOLスクリプト実行成功")
-
-            # キャッシュの送信済みフラグを更新
-            self.logger.info("キャッシュ更新開始")
-            self._mark_wol_sent(cache_data)
-
-            self.logger.info(f"WOL送信完了成功 (MAC: {mac_address})")
             return True
 
         except subprocess.TimeoutExpired:
             self.logger.error("WOL送信タイムアウト (スクリプト実行時間超過)")
             return False
-        except Exception as e:
-            self.logger.error(f"WOL送信エラー: {e}")
-            return False
 
-    def _mark_wol_sent(self, cache_data):
+    def _mark_wol_sent(self, cache_data, timing):
         """
         キャッシュの送信済みフラグを更新
 
+        今回の送信のきっかけとなったタイミングのフラグのみ更新する
+        （同じ許容範囲内にある他の予約も同じWOLで起動するため送信済みとする）。
+        常駐実行時は差分受信スレッドと競合しないようロックを取得して更新する
+
         Args:
             cache_data: キャッシュデータ
+            timing: 送信のきっかけとなったタイミング（"first" or "second"）
         """
-        try:
-            now = datetime.now()
-            first_minutes = self.config["wol_timing"]["first_minutes"]
-            second_minutes = self.config["wol_timing"]["second_minutes"]
-
-            self.logger.debug("送信済みフラグ更新処理開始")
-            updated_count = 0
+        with self._lock:
+            try:
+                now = self.clock()
+                first_minutes = self._first_minutes()
+                second_minutes = self.config["wol_timing"]["second_minutes"]
+
+                self.logger.debug("送信済みフラグ更新処理開始")
+                updated_count = 0
+
+                for reserve in cache_data["reserves"]:
+                    try:
+                        start_time = datetime.fromisoformat(reserve["start_time"])
+                        time_until_start = (start_time - now).total_seconds() / 60
+                        program_name = reserve.get("program_name", "不明")
+
+                        # 第1タイミングで送信の場合
+                        in_first_window = (
+                            (first_minutes - FIRST_WINDOW_BEFORE) <= time_until_start <= (first_minutes + FIRST_WINDOW_AFTER)
+                        )
+                        if timing == "first" and in_first_window:
+                            if not reserve.get("wol_sent_first", False):
+                                reserve["wol_sent_first"] = True
+                                self.logger.debug(f"第1タイミング送信済みフラグ更新: {program_name}")
+                                updated_count += 1
+
+                        # 第2タイミングで送信の場合
+                        in_second_window = (
+                            (second_minutes - SECOND_WINDOW) <= time_until_start <= (second_minutes + SECOND_WINDOW)
+                        )
+                        if timing == "second" and in_second_window:
+                            if not reserve.get("wol_sent_second", False):
+                                reserve["wol_sent_second"] = True
+                                self.logger.debug(f"第2タイミング送信済みフラグ更新: {program_name}")
+                                updated_count += 1
 
-            for reserve in cache_data["reserves"]:
-                try:
-                    start_time = datetime.fromisoformat(reserve["start_time"])
-                    time_until_start = (start_time - now).total_seconds() / 60
-                    program_name = reserve.get("program_name", "不明")
-
-                    # 第1タイミングで送信の場合
-                    if (first_minutes - 5) <= time_until_start <= (first_minutes + 2):
-                        if not reserve.get("wol_sent_first", False):
-                            reserve["wol_sent_first"] = True
-                            self.logger.debug(f"第1タイミング送信済みフラグ更新: {program_name}")
-                            updated_count += 1
-
-                    # 第2タイミングで送信の場合
-                    if (second_minutes - 2) <= time_until_start <= (second_minutes + 2):
-                        if not reserve.get("wol_sent_second", False):
-                            reserve["wol_sent_second"] = True
-                            self.logger.debug(f"第2タイミング送信済みフラグ更新: {program_name}")
-                            updated_count += 1
-
-                except (ValueError, KeyError) as e:
-                    self.logger.debug(f"予約情報処理エラー: {e}")
-                    continue
+                    except (ValueError, KeyError) as e:
+                        self.logger.debug(f"予約情報処理エラー: {e}")
+                        continue
 
-            # キャッシュを保存
-            self.logger.info(f"キャッシュファイル保存開始（更新件数: {updated_count}件）")
-            with open(self.cache_path, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+                # キャッシュを保存
+                self.logger.info(f"キャッシュファイル保存開始（更新件数: {updated_count}件）")
+                with open(self.cache_path, "w", encoding="utf-8") as f:
+                    json.dump(cache_data, f, ensure_ascii=False, indent=2)
+                if self.resident:
+                    self._cache_mtime = self._stat_cache_mtime()
+                    self._index_wake_deadlines(cache_data)
 
-            self.logger.info(f"キャッシュファイル保存完了: {self.cache_path}")
+                self.logger.info(f"キャッシュファイル保存完了: {self.cache_path}")
 
-        except Exception as e:
-            self.logger.error(f"キャッシュ更新エラー: {e}")
+            except Exception as e:
+                self.logger.error(f"キャッシュ更新エラー: {e}")
 
 
 def main():
     """メイン処理"""
+    # 常駐モード判定（--daemon フラグで有効化）
+    daemon_mode = "--daemon" in sys.argv
+
     # パスの設定
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_dir = os.path.dirname(script_dir)
@@ -351,7 +795,13 @@ def main():
     # WOLチェック・送信実行
     try:
         checker = WOLChecker(config_path, cache_path, log_dir)
-        success = checker.check_and_send()
+        if daemon_mode:
+            signal.signal(signal.SIGTERM, lambda signum, frame: checker.stop())
+            interval_seconds = checker.config.get("daemon", {}).get("interval_seconds", 60)
+            checker.run_forever(interval_seconds)
+            success = True
+        else:
+            success = checker.check_and_send()
 
         if success:
             exit_code = 0
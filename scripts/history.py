@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+実行履歴集計スクリプト
+
+check_and_wol.py / update_cache.py が記録した実行履歴ジャーナルを集計し、
+処理時間・WOL送信回数・起動失敗を表示します
+
+実行: 手動実行
+使用法: history.py [--days N]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+from utils.history import create_history
+from utils.stats import percentile
+
+
+# 送信すべき予約があったのにWOLを送信できなかった実行の状態
+MISSED_STATUSES = ("send_failed", "stale_cache", "error")
+
+
+def summarize(records):
+    """
+    実行履歴レコードを集計
+
+    送信すべき予約があったのに送信できなかった実行（送信失敗・キャッシュ期限切れ・エラー）を
+    予約IDごとにまとめ、後の実行で送信できた予約は除外して「WOLを送信できなかった予約」とする。
+    キャッシュがない場合や予約特定前のエラーは予約を判定できないため別に集計する
+
+    Args:
+        records: 実行履歴レコードのイテラブル
+
+    Returns:
+        dict: 集計結果
+    """
+    runs = 0
+    statuses = Counter()
+    totals = []
+    probes = []
+    wakes_per_day = Counter()
+    missed = OrderedDict()
+    woken_ids = set()
+    unknown_runs = 0
+
+    for record in records:
+        runs += 1
+        status = record.get("status")
+        statuses[status] += 1
+
+        durations = record.get("durations_ms", {})
+        if "total" in durations:
+            totals.append(durations["total"])
+        if "probe" in durations:
+            probes.append(durations["probe"])
+
+        reserve_id = record.get("reserve_id")
+        if record.get("wol_sent"):
+            wakes_per_day[record.get("ts", "")[:10]] += 1
+            woken_ids.add(reserve_id)
+        elif status in MISSED_STATUSES and reserve_id is not None:
+            missed.setdefault(reserve_id, record)
+        elif status in ("no_cache", "error"):
+            unknown_runs += 1
+
+    totals.sort()
+    probes.sort()
+
+    return {
+        "runs": runs,
+        "statuses": dict(statuses),
+        "latency_ms": {
+            "total_p50": percentile(totals, 50),
+            "total_p95": percentile(totals, 95),
+            "total_max": totals[-1] if totals else None,
+            "probe_p50": percentile(probes, 50),
+            "probe_p95": percentile(probes, 95)
+        },
+        "wakes_per_day": dict(sorted(wakes_per_day.items())),
+        "missed_wakes": [
+            {"ts": r.get("ts"), "reserve_id": reserve_id, "status": r.get("status")}
+            for reserve_id, r in missed.items()
+            if reserve_id not in woken_ids
+        ],
+        "unknown_runs": unknown_runs
+    }
+
+
+def _format_ms(value):
+    """ミリ秒の値を表示用に整形（値がない場合は "-"）"""
+    return "-" if value is None else f"{value}ms"
+
+
+def print_summary(title, summary):
+    """集計結果を表示"""
+    latency = summary["latency_ms"]
+    print(f"== {title} ==")
+    print(f"実行回数: {summary['runs']}回")
+    for status, count in sorted(summary["statuses"].items(), key=lambda x: str(x[0])):
+        print(f"  {status}: {count}回")
+    print(
+        f"処理時間: p50={_format_ms(latency['total_p50'])} / p95={_format_ms(latency['total_p95'])} / "
+        f"最大={_format_ms(latency['total_max'])}"
+    )
+    if latency["probe_p50"] is not None:
+        print(f"PC起動確認: p50={_format_ms(latency['probe_p50'])} / p95={_format_ms(latency['probe_p95'])}")
+    if summary["wakes_per_day"]:
+        print("日別WOL送信回数:")
+        for day, count in summary["wakes_per_day"].items():
+            print(f"  {day}: {count}回")
+    if summary["missed_wakes"]:
+        print(f"WOLを送信できなかった予約: {len(summary['missed_wakes'])}件")
+        for missed in summary["missed_wakes"]:
+            print(f"  {missed['ts']} (予約ID: {missed['reserve_id']}, 状態: {missed['status']})")
+    if summary["unknown_runs"]:
+        print(f"予約を判定できなかった実行（キャッシュなし・エラー）: {summary['unknown_runs']}回")
+    print("")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="実行履歴を集計します")
+    parser.add_argument("--days", type=float, default=7, help="集計対象の日数（デフォルト: 7）")
+    parser.add_argument("--json", action="store_true", help="集計結果をJSONで出力")
+    args = parser.parse_args()
+
+    # パスの設定
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_dir = os.path.dirname(script_dir)
+    config_path = os.path.join(project_dir, "config", "config.json")
+
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        config = {}
+    log_dir = os.path.expanduser(
+        config.get("logging", {}).get("dir", os.path.join(project_dir, "logs"))
+    )
+
+    since = datetime.now() - timedelta(days=args.days)
+    results = {}
+    for name in ("wol", "update"):
+        history = create_history(config, log_dir, name)
+        if history is None:
+            print("実行履歴の記録が無効化されています（history.enabled）")
+            sys.exit(1)
+        results[name] = summarize(history.read(since=since))
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_summary(f"WOL送信チェック（過去{args.days:g}日）", results["wol"])
+        print_summary(f"キャッシュ更新（過去{args.days:g}日）", results["update"])
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,23 @@
 WOL（Wake-on-LAN）送信ユーティリティ
 
 指定されたMACアドレスへWOLパケットを送信します
+複数のMACアドレス・複数のブロードキャストアドレスへの一括送信にも対応します
 """
 
+import argparse
 import socket
 import struct
 import sys
 import os
+import time
 
 sys.path.insert(0, os.path.dirname(__file__))
 
+DEFAULT_BROADCAST_ADDRESS = "255.255.255.255"
+DEFAULT_PORT = 9
 
-def send_wol(mac_address, broadcast_address="255.255.255.255", port=9):
+
+def send_wol(mac_address, broadcast_address=DEFAULT_BROADCAST_ADDRESS, port=DEFAULT_PORT):
     """
     WOLパケットを送信
 
@@ -28,30 +34,176 @@ def send_wol(mac_address, broadcast_address="255.255.255.255", port=9):
     Raises:
         ValueError: MACアドレス形式が無効の場合
     """
-    # MACアドレス形式の検証と正規化
-    mac_bytes = _parse_mac_address(mac_address)
+    # MACアドレス形式の検証（無効な場合はここでValueError）
+    _parse_mac_address(mac_address)
 
-    # WOLパケット構築
-    # ヘッダ: 0xFFが6回繰り返される
-    header = bytes([0xFF] * 6)
-    # ペイロード: MACアドレスが16回繰り返される
-    payload = mac_bytes * 16
-    wol_packet = header + payload
+    target = {
+        "mac": mac_address,
+        "destinations": [broadcast_address],
+        "port": port,
+        "password": None
+    }
+    result = send_wol_batch([target])[0]
+    for error in result["errors"]:
+        print(f"WOL送信エラー: {error}", file=sys.stderr)
+    return result["success"]
+
+
+def send_wol_batch(targets, repeat=1, interval=0.0):
+    """
+    複数の対象へWOLパケットを一括送信
+
+    全パケットを事前に構築し、1つのソケットで送信します
+
+    Args:
+        targets (list): 送信対象のリスト。各要素は以下のキーを持つ辞書
+            - mac (str): MACアドレス
+            - destinations (list): 送信先アドレス（ブロードキャスト/サブネットブロードキャスト）
+            - port (int): ポート番号
+            - password (str): SecureOnパスワード（不要ならNone）
+        repeat (int): 送信回数（全対象への送信を1巡として繰り返す）
+        interval (float): 繰り返し間の待ち時間（秒）
+
+    Returns:
+        list: 対象ごとの送信結果（mac, sent, success, errors を持つ辞書）
+    """
+    results = []
+    sends = []
+
+    # パケット構築（無効な対象は送信せず結果にエラーを記録）
+    for target in targets:
+        result = {"mac": target.get("mac"), "sent": 0, "success": False, "errors": []}
+        results.append(result)
+        try:
+            packet = build_wol_packet(target["mac"], target.get("password"))
+        except (ValueError, KeyError) as e:
+            result["errors"].append(str(e))
+            continue
+
+        port = target.get("port", DEFAULT_PORT)
+        for destination in target.get("destinations") or [DEFAULT_BROADCAST_ADDRESS]:
+            sends.append((result, packet, (destination, port)))
+
+    if not sends:
+        return results
 
     try:
         # ソケット作成（UDP）
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    except OSError as e:
+        for result, _, _ in sends:
+            result["errors"].append(str(e))
+        return results
+
+    try:
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
 
-        # パケット送信
-        sock.sendto(wol_packet, (broadcast_address, port))
+        for i in range(repeat):
+            if i > 0 and interval > 0:
+                time.sleep(interval)
+            for result, packet, address in sends:
+                try:
+                    sock.sendto(packet, address)
+                    result["sent"] += 1
+                except (OSError, OverflowError, TypeError) as e:
+                    # 1件の不正な送信先で他の対象への送信を中断しない
+                    result["errors"].append(f"{address[0]}:{address[1]}: {e}")
+    finally:
         sock.close()
 
-        return True
-    except Exception as e:
-        print(f"WOL送信エラー: {e}", file=sys.stderr)
-        return False
+    for result in results:
+        result["success"] = result["sent"] > 0 and not result["errors"]
+    return results
+
+
+def build_wol_packet(mac_address, password=None):
+    """
+    WOLパケット（マジックパケット）を構築
+
+    Args:
+        mac_address (str): MACアドレス
+        password (str): SecureOnパスワード（不要ならNone）
+
+    Returns:
+        bytes: WOLパケット
+
+    Raises:
+        ValueError: MACアドレス・パスワード形式が無効の場合
+    """
+    mac_bytes = _parse_mac_address(mac_address)
+
+    # ヘッダ: 0xFFが6回繰り返される
+    header = bytes([0xFF] * 6)
+    # ペイロード: MACアドレスが16回繰り返される
+    payload = mac_bytes * 16
+    wol_packet = header + payload
+
+    # SecureOnパスワードは末尾に付加
+    if password:
+        wol_packet += _parse_password(password)
+
+    return wol_packet
+
+
+def parse_target(spec, default_port=DEFAULT_PORT):
+    """
+    送信対象の指定文字列を解析
+
+    形式: MAC [送信先[,送信先...]] [ポート] [SecureOnパスワード]
+
+    Args:
+        spec (str): 送信対象の指定文字列
+        default_port (int): ポート未指定時のポート番号
+
+    Returns:
+        dict: 送信対象（send_wol_batch の targets 要素）
+
+    Raises:
+        ValueError: 形式が無効の場合
+    """
+    fields = spec.split()
+    if not fields or len(fields) > 4:
+        raise ValueError(f"無効な送信対象の指定: {spec}")
+
+    target = {
+        "mac": fields[0],
+        "destinations": [DEFAULT_BROADCAST_ADDRESS],
+        "port": default_port,
+        "password": None
+    }
+    if len(fields) > 1:
+        target["destinations"] = [d for d in fields[1].split(",") if d]
+    if len(fields) > 2:
+        target["port"] = _parse_port(fields[2])
+    if len(fields) > 3:
+        target["password"] = fields[3]
+
+    # 形式の検証
+    build_wol_packet(target["mac"], target["password"])
+    return target
+
+
+def _parse_port(port):
+    """
+    ポート番号を検証して整数に変換
+
+    Args:
+        port (str or int): ポート番号
+
+    Returns:
+        int: ポート番号
+
+    Raises:
+        ValueError: ポート番号が無効（0-65535の範囲外）の場合
+    """
+    try:
+        value = int(port)
+    except (ValueError, TypeError):
+        raise ValueError(f"無効なポート番号: {port}")
+    if not 0 <= value <= 65535:
+        raise ValueError(f"無効なポート番号: {port}")
+    return value
 
 
 def _parse_mac_address(mac_address):
@@ -78,15 +230,119 @@ def _parse_mac_address(mac_address):
     return bytes.fromhex(mac)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def _parse_password(password):
+    """
+    SecureOnパスワード文字列をバイト列に変換
+
+    Args:
+        password (str): パスワード文字列
+            (XX:XX:XX:XX:XX:XX形式の6バイト、または a.b.c.d 形式の4バイト)
+
+    Returns:
+        bytes: パスワードのバイト列
+
+    Raises:
+        ValueError: パスワード形式が無効の場合
+    """
+    if "." in password:
+        try:
+            if password.count(".") != 3:
+                raise OSError
+            return socket.inet_aton(password)
+        except OSError:
+            raise ValueError(f"無効なSecureOnパスワード形式: {password}")
+
+    hex_password = password.replace(":", "").replace("-", "")
+    if len(hex_password) not in (8, 12) or not all(c in "0123456789abcdefABCDEF" for c in hex_password):
+        raise ValueError(f"無効なSecureOnパスワード形式: {password}")
+    return bytes.fromhex(hex_password)
+
+
+def _read_targets(path, default_port):
+    """
+    ファイル（"-" の場合は標準入力）から送信対象を読み込み
+
+    空行と # で始まる行は無視します
+    """
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    return [
+        parse_target(line, default_port)
+        for line in lines
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description="WOLパケットを送信します",
+        epilog="送信対象の形式: MAC [送信先[,送信先...]] [ポート] [SecureOnパスワード]"
+    )
+    parser.add_argument("mac", nargs="?", help="MACアドレス (XX:XX:XX:XX:XX:XX)")
+    parser.add_argument("broadcast", nargs="?", default=DEFAULT_BROADCAST_ADDRESS, help="ブロードキャストアドレス")
+    parser.add_argument("port", nargs="?", type=int, default=DEFAULT_PORT, help="ポート番号")
+    parser.add_argument("-t", "--target", action="append", default=[], help="送信対象（複数指定可）")
+    parser.add_argument("-f", "--file", help="送信対象を1行1件で記載したファイル（- で標準入力）")
+    parser.add_argument("--password", help="位置引数で指定した対象のSecureOnパスワード")
+    parser.add_argument("--repeat", type=int, default=1, help="送信回数（デフォルト: 1）")
+    parser.add_argument("--interval", type=float, default=0.0, help="繰り返し間の待ち時間（秒）")
+    args = parser.parse_args()
+
+    try:
+        _parse_port(args.port)
+    except ValueError as e:
+        print(f"送信対象の読み込みエラー: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    positional_target = None
+    if args.mac:
+        positional_target = {
+            "mac": args.mac,
+            "destinations": [args.broadcast],
+            "port": args.port,
+            "password": args.password
+        }
+
+    # 従来形式（send_wol.py MAC [BROADCAST] [PORT]）
+    if positional_target and not args.target and not args.file:
+        result = send_wol_batch([positional_target], args.repeat, args.interval)[0]
+        for error in result["errors"]:
+            print(f"WOL送信エラー: {error}", file=sys.stderr)
+        sys.exit(0 if result["success"] else 1)
+
+    # 一括送信
+    try:
+        targets = [parse_target(spec, args.port) for spec in args.target]
+        if positional_target:
+            build_wol_packet(positional_target["mac"], positional_target["password"])
+            targets.insert(0, positional_target)
+        if args.file:
+            targets.extend(_read_targets(args.file, args.port))
+    except (ValueError, OSError) as e:
+        print(f"送信対象の読み込みエラー: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not targets:
         print("使用法: send_wol.py <MAC_ADDRESS> [BROADCAST_ADDRESS] [PORT]")
+        print("        send_wol.py -t \"<MAC_ADDRESS> [送信先,...] [PORT] [PASSWORD]\" ... [-f FILE]")
         print("  例: send_wol.py XX:XX:XX:XX:XX:XX")
+        print("      send_wol.py -t \"XX:XX:XX:XX:XX:XX 192.168.1.255,192.168.2.255\" --repeat 3")
         sys.exit(1)
 
-    mac_addr = sys.argv[1]
-    broadcast_addr = sys.argv[2] if len(sys.argv) > 2 else "255.255.255.255"
-    wol_port = int(sys.argv[3]) if len(sys.argv) > 3 else 9
+    results = send_wol_batch(targets, args.repeat, args.interval)
+    for result in results:
+        if result["success"]:
+            print(f"{result['mac']}: OK ({result['sent']}パケット)")
+        else:
+            print(f"{result['mac']}: NG ({'; '.join(result['errors'])})")
+
+    sys.exit(0 if all(r["success"] for r in results) else 1)
 
-    success = send_wol(mac_addr, broadcast_addr, wol_port)
-    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
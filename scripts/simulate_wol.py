@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+WOLスケジュール シミュレーションスクリプト
+
+予約情報（reserves.json または EnumReserveInfo のAPI応答XML）を仮想時計で再生し、
+WOLChecker の判定ロジックが全ての録画に間に合うかを検証します
+実際のWOL送信・PC起動確認は行わず、PCの電源状態はシミュレーションします
+
+実行: 手動実行
+使用法: simulate_wol.py (--reserves FILE | --api-response FILE) [--days N] [オプション]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+from check_and_wol import WOLChecker
+
+
+class VirtualClock:
+    """仮想時計"""
+
+    def __init__(self, start):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+class SimulatedPC:
+    """
+    PC電源状態のシミュレーション
+
+    アイドルモデル: 起動完了（録画中は録画終了）から idle_minutes 分経過した時点でスリープする。
+    スリープする時刻ちょうどに開始する録画は間に合ったものとして扱う
+    """
+
+    def __init__(self, boot_seconds, idle_minutes):
+        """
+        初期化
+
+        Args:
+            boot_seconds: WOL受信から起動完了までの時間（秒）
+            idle_minutes: 録画終了（または起動）からスリープするまでの時間（分）
+        """
+        self.boot_time = timedelta(seconds=boot_seconds)
+        self.idle_time = timedelta(minutes=idle_minutes)
+        self.state = "off"
+        self.woke_at = None
+        self.boot_done_at = None
+        self.last_active = None
+        self.recorded = False
+        self.awake_total = timedelta()
+        self.wakes = 0
+        self.idle_wakes = 0
+
+    def wake(self, now):
+        """
+        WOLパケットを受信
+
+        Returns:
+            bool: 既に起動中・起動処理中で不要な送信だった場合True
+        """
+        if self.state != "off":
+            return True
+        self.state = "booting"
+        self.woke_at = now
+        self.boot_done_at = now + self.boot_time
+        self.last_active = self.boot_done_at
+        self.recorded = False
+        self.wakes += 1
+        return False
+
+    def is_on_at(self, when):
+        """指定時刻に起動完了しているか（スリープする時刻ちょうどは起動中とみなす）"""
+        if self.state == "off":
+            return False
+        if self.state == "booting" and self.boot_done_at > when:
+            return False
+        return self.last_active + self.idle_time >= when
+
+    def start_recording(self, end_time):
+        """録画開始（録画終了までスリープしない）"""
+        self.recorded = True
+        self.last_active = max(self.last_active, end_time)
+
+    def advance(self, now):
+        """指定時刻まで状態を進める"""
+        if self.state == "booting" and self.boot_done_at <= now:
+            self.state = "on"
+        if self.state == "on" and self.last_active + self.idle_time <= now:
+            self._sleep(self.last_active + self.idle_time)
+
+    def finish(self, now):
+        """シミュレーション終了時点までの起動時間を集計"""
+        if self.state != "off":
+            self._sleep(min(now, self.last_active + self.idle_time) if self.state == "on" else now)
+
+    def _sleep(self, when):
+        self.awake_total += when - self.woke_at
+        if not self.recorded:
+            self.idle_wakes += 1
+        self.state = "off"
+
+
+class SimulatedPCMonitor:
+    """PCMonitor の代わりにシミュレーション中のPC状態を返す"""
+
+    def __init__(self, pc):
+        self.pc = pc
+        self.probes = 0
+
+    def is_pc_alive(self, method="ping"):
+        self.probes += 1
+        return self.pc.state == "on"
+
+
+def load_reserves(reserves_path=None, api_response_path=None, config_path=None):
+    """
+    シミュレーション対象の予約を読み込み
+
+    Args:
+        reserves_path: reserves.json（キャッシュ形式）のパス
+        api_response_path: EnumReserveInfo のAPI応答XMLのパス
+        config_path: 設定ファイルパス（API応答XMLの解析に使用）
+
+    Returns:
+        list: 予約情報リスト（開始時刻順）
+    """
+    if reserves_path:
+        with open(reserves_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        reserves = data["reserves"] if isinstance(data, dict) else data
+    else:
+        # update_cache.py と同じ解析処理を使う
+        from update_cache import CacheUpdater
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            updater = CacheUpdater(config_path, os.path.join(tmp_dir, "reserves.json"), tmp_dir)
+            root = ET.parse(api_response_path).getroot()
+            reserves = [r for r in map(updater._parse_reserve_info, root.findall(".//reserveinfo")) if r]
+
+    for reserve in reserves:
+        reserve["wol_sent_first"] = False
+        reserve["wol_sent_second"] = False
+    return sorted(reserves, key=lambda r: r["start_time"])
+
+
+def simulate(config_path, reserves, start, end, interval_minutes=5, boot_seconds=120,
+             idle_minutes=30, update_interval_minutes=10, timing_overrides=None):
+    """
+    シミュレーションを実行
+
+    Args:
+        config_path: 設定ファイルパス
+        reserves: 予約情報リスト
+        start: シミュレーション開始時刻
+        end: シミュレーション終了時刻
+        interval_minutes: check_and_wol.py の実行間隔（分）
+        boot_seconds: PCの起動所要時間（秒）
+        idle_minutes: PCがスリープするまでの無操作時間（分）
+        update_interval_minutes: update_cache.py の実行間隔（分）
+        timing_overrides: wol_timing 設定の上書き（dict）
+
+    Returns:
+        dict: シミュレーション結果
+    """
+    clock = VirtualClock(start)
+    pc = SimulatedPC(boot_seconds, idle_minutes)
+    monitor = SimulatedPCMonitor(pc)
+    wol_log = []
+
+    def send(mac_address):
+        redundant = pc.wake(clock.now)
+        wol_log.append({"time": clock.now.isoformat(), "redundant": redundant})
+        return True
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "reserves.json")
+        cache_data = {"last_updated": start.isoformat(), "reserves": reserves}
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache_data, f, ensure_ascii=False)
+
+        checker = WOLChecker(config_path, cache_path, tmp_dir, clock=clock, pc_monitor=monitor, wol_sender=send)
+        checker.history = None
+        if timing_overrides:
+            checker.config["wol_timing"].update(timing_overrides)
+        if checker.boot_latency is not None:
+            # 学習状態は実運用のものを使わず、シミュレーション内で学習する
+            checker.boot_latency.state_path = os.path.join(tmp_dir, "boot_latency.json")
+            checker.boot_latency.state = {"hosts": {}}
+
+        interval = timedelta(minutes=interval_minutes)
+        update_interval = timedelta(minutes=update_interval_minutes)
+        last_cache_update = start
+        missed = []
+        pending = [r for r in reserves if start <= datetime.fromisoformat(r["start_time"]) < end]
+        index = 0
+
+        while clock.now < end:
+            # 前回チェック以降に開始した予約の録画可否を判定
+            while index < len(pending) and datetime.fromisoformat(pending[index]["start_time"]) <= clock.now:
+                reserve = pending[index]
+                index += 1
+                start_time = datetime.fromisoformat(reserve["start_time"])
+                # スリープ判定より先に録画開始を判定する
+                if pc.is_on_at(start_time):
+                    pc.start_recording(datetime.fromisoformat(reserve["end_time"]))
+                else:
+                    missed.append(reserve)
+
+            pc.advance(clock.now)
+
+            # PC起動中はキャッシュ更新が成功する
+            if pc.state == "on" and clock.now - last_cache_update >= update_interval:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    cache_data = json.load(f)
+                cache_data["last_updated"] = clock.now.isoformat()
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump(cache_data, f, ensure_ascii=False)
+                last_cache_update = clock.now
+
+            checker.check_and_send()
+
+            clock.now += interval
+
+        pc.finish(end)
+
+    return {
+        "period": {"start": start.isoformat(), "end": end.isoformat()},
+        "reserves": len(pending),
+        "missed_wakes": [
+            {"id": r.get("id"), "program_name": r.get("program_name"), "start_time": r["start_time"]}
+            for r in missed
+        ],
+        "wol_sent": len(wol_log),
+        "redundant_wakes": [w["time"] for w in wol_log if w["redundant"]],
+        "wakes": pc.wakes,
+        "wakes_without_recording": pc.idle_wakes,
+        "pc_awake_hours": round(pc.awake_total.total_seconds() / 3600, 2),
+        "idle_minutes": idle_minutes,
+        "checks": monitor.probes
+    }
+
+
+def print_report(result):
+    """シミュレーション結果を表示"""
+    print(f"期間: {result['period']['start']} ～ {result['period']['end']}")
+    print(f"対象予約: {result['reserves']}件 / チェック回数: {result['checks']}回")
+    print(f"WOL送信: {result['wol_sent']}回（うち不要な送信: {len(result['redundant_wakes'])}回）")
+    print(f"PC起動: {result['wakes']}回（うち録画なし: {result['wakes_without_recording']}回）")
+    print(f"PC起動時間合計: {result['pc_awake_hours']}時間")
+    print(f"PCのスリープ: 起動完了・録画終了から{result['idle_minutes']:g}分後")
+    print(f"起動が間に合わなかった予約: {len(result['missed_wakes'])}件")
+    for missed in result["missed_wakes"]:
+        print(f"  {missed['start_time']} {missed['program_name']} (予約ID: {missed['id']})")
+
+
+def main():
+    """メイン処理"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_dir = os.path.dirname(script_dir)
+
+    parser = argparse.ArgumentParser(description="予約情報を仮想時計で再生し、WOLスケジュールを検証します")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--reserves", help="reserves.json（キャッシュ形式）")
+    source.add_argument("--api-response", help="EnumReserveInfo のAPI応答XML")
+    parser.add_argument("--config", default=os.path.join(project_dir, "config", "config.json"), help="設定ファイル")
+    parser.add_argument("--start", help="開始日時（ISO形式、省略時は最初の予約の1時間前）")
+    parser.add_argument("--days", type=float, default=7, help="シミュレーション日数（デフォルト: 7）")
+    parser.add_argument("--interval", type=float, default=5, help="チェック間隔（分、デフォルト: 5）")
+    parser.add_argument("--update-interval", type=float, default=10, help="キャッシュ更新間隔（分、デフォルト: 10）")
+    parser.add_argument("--boot-seconds", type=float, default=120, help="PC起動所要時間（秒、デフォルト: 120）")
+    parser.add_argument("--idle-minutes", type=float, default=30, help="PCがスリープするまでの時間（分、デフォルト: 30）")
+    parser.add_argument("--first-minutes", type=int, help="wol_timing.first_minutes を上書き")
+    parser.add_argument("--second-minutes", type=int, help="wol_timing.second_minutes を上書き")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args()
+
+    reserves = load_reserves(args.reserves, args.api_response, args.config)
+    if not reserves:
+        print("予約がありません")
+        sys.exit(1)
+
+    if args.start:
+        start = datetime.fromisoformat(args.start)
+    else:
+        start = datetime.fromisoformat(reserves[0]["start_time"]) - timedelta(hours=1)
+    end = start + timedelta(days=args.days)
+
+    timing_overrides = {}
+    if args.first_minutes is not None:
+        timing_overrides["first_minutes"] = args.first_minutes
+    if args.second_minutes is not None:
+        timing_overrides["second_minutes"] = args.second_minutes
+
+    # シミュレーション中の大量のログ出力を抑止
+    logging.getLogger("wol").disabled = True
+
+    result = simulate(
+        args.config, reserves, start, end,
+        interval_minutes=args.interval,
+        boot_seconds=args.boot_seconds,
+        idle_minutes=args.idle_minutes,
+        update_interval_minutes=args.update_interval,
+        timing_overrides=timing_overrides
+    )
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+
+    sys.exit(1 if result["missed_wakes"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,15 @@ epg station REST APIから予約情報を取得し、
 import json
 import os
 import sys
+import time
 import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(__file__))
+from utils.cache_sync import diff_reserves, push_reserve_diff
+from utils.history import append_record, create_history, elapsed_ms, new_record
 from utils.logger import Logger
 
 
@@ -36,6 +39,7 @@ class CacheUpdater:
         self.config = self._load_config(config_path)
         self.cache_path = cache_path
         self.logger = Logger(log_dir, "update", level="INFO", debug=debug)
+        self.history = create_history(self.config, log_dir, "update")
 
         if debug:
             self.logger.info("デバッグモード有効: コンソール出力を表示します")
@@ -60,17 +64,45 @@ class CacheUpdater:
         Returns:
             bool: 更新成功ならTrue
         """
+        record = new_record()
+        started = time.monotonic()
+        result = False
+
+        try:
+            result = self._update(record)
+            return result
+        finally:
+            record["durations_ms"]["total"] = elapsed_ms(started)
+            record["result"] = result
+            append_record(self.history, record, self.logger)
+
+    def _update(self, record):
+        """
+        キャッシュ更新の本体
+
+        Args:
+            record: 実行履歴レコード（処理結果を書き込む）
+
+        Returns:
+            bool: 更新成功ならTrue
+        """
+        durations = record["durations_ms"]
+
         try:
             self.logger.info("キャッシュ更新処理開始")
 
             # EPG Station APIから予約情報を取得
             self.logger.info("EPG Station APIから予約情報を取得中...")
+            phase_started = time.monotonic()
             reserves = self._fetch_reserves()
+            durations["fetch"] = elapsed_ms(phase_started)
             if reserves is None:
                 self.logger.error("予約情報取得失敗")
+                record["status"] = "fetch_failed"
                 return False
 
             self.logger.info(f"予約情報取得成功: {len(reserves)}件")
+            record["reserve_count"] = len(reserves)
 
             # キャッシュデータを構築
             now = datetime.now().isoformat()
@@ -80,21 +112,74 @@ class CacheUpdater:
             }
             self.logger.info(f"キャッシュデータ構築完了（更新時刻: {now}）")
 
+            # 常駐チェッカーへ送る差分のため、更新前の予約情報を取得
+            old_reserves = self._load_old_reserves()
+
             # キャッシュを保存
             cache_dir = os.path.dirname(self.cache_path)
             os.makedirs(cache_dir, exist_ok=True)
             self.logger.info(f"キャッシュファイル保存開始: {self.cache_path}")
 
+            phase_started = time.monotonic()
             with open(self.cache_path, "w", encoding="utf-8") as f:
                 json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            durations["save"] = elapsed_ms(phase_started)
 
             self.logger.info(f"キャッシュ更新成功: {len(reserves)}件の予約を保存")
+            record["status"] = "updated"
+
+            # 常駐チェッカーへ差分を送信（失敗してもファイル経由で反映される）
+            if old_reserves is not None:
+                phase_started = time.monotonic()
+                self._push_diff(old_reserves, cache_data)
+                durations["push"] = elapsed_ms(phase_started)
             return True
 
         except Exception as e:
             self.logger.error(f"キャッシュ更新中にエラー: {e}")
+            record["status"] = "error"
             return False
 
+    def _load_old_reserves(self):
+        """
+        差分送信用に更新前の予約情報を読み込み
+
+        Returns:
+            list: 更新前の予約情報、差分送信が無効の場合はNone
+        """
+        if not self.config.get("daemon", {}).get("sync_socket"):
+            return None
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("reserves", [])
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            return []
+
+    def _push_diff(self, old_reserves, cache_data):
+        """
+        常駐中のWOLチェッカーへ予約情報の差分を送信
+
+        Args:
+            old_reserves: 更新前の予約情報リスト
+            cache_data: 保存したキャッシュデータ
+        """
+        socket_path = os.path.expanduser(self.config["daemon"]["sync_socket"])
+        diff = diff_reserves(old_reserves, cache_data["reserves"])
+        diff["last_updated"] = cache_data["last_updated"]
+
+        try:
+            if push_reserve_diff(socket_path, diff):
+                self.logger.info(
+                    f"常駐チェッカーへ差分送信: 追加{len(diff['added'])}件 / "
+                    f"削除{len(diff['removed'])}件 / 変更{len(diff['changed'])}件"
+                )
+            else:
+                self.logger.warning("常駐チェッカーが差分を適用できませんでした（ファイル経由で反映）")
+        except OSError as e:
+            # 常駐チェッカーが起動していない場合はファイル経由で反映される
+            self.logger.info(f"常駐チェッカーへ差分を送信できません（ファイル経由で反映）: {e}")
+
     def _fetch_reserves(self):
         """
         EPG Station APIから予約情報を取得
@@ -0,0 +1,117 @@
+import json
+import os
+from datetime import datetime
+
+from .stats import percentile
+
+
+class BootLatencyTracker:
+    """PC起動所要時間の学習ユーティリティ"""
+
+    def __init__(self, state_path, percentile=90, window=20, min_samples=3, max_pending_minutes=60):
+        """
+        起動所要時間トラッカー初期化
+
+        Args:
+            state_path: 学習状態の保存先ファイルパス
+            percentile: 推定に使うパーセンタイル（0-100）
+            window: 保持する直近の計測数
+            min_samples: 推定値を使い始める最小計測数
+            max_pending_minutes: WOL送信からこの時間内に起動確認できなければ計測を破棄（分）
+        """
+        self.state_path = state_path
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.max_pending_minutes = max_pending_minutes
+        self.state = self._load_state()
+
+    def _load_state(self):
+        """学習状態を読み込み（存在しない・壊れている場合は空）"""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if isinstance(state.get("hosts"), dict):
+                return state
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            pass
+        return {"hosts": {}}
+
+    def _save_state(self):
+        """学習状態を保存"""
+        state_dir = os.path.dirname(self.state_path)
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _host(self, host):
+        return self.state["hosts"].setdefault(host, {"pending_since": None, "samples": []})
+
+    def record_wol_sent(self, host, now):
+        """
+        WOL送信を記録（起動確認までの計測開始）
+
+        計測中にWOLを再送した場合は最初の送信時刻を維持する
+
+        Args:
+            host: ホスト識別子（MACアドレス）
+            now: 送信時刻（datetime）
+        """
+        entry = self._host(host)
+        if entry["pending_since"] is None or self._pending_expired(entry, now):
+            entry["pending_since"] = now.isoformat()
+            self._save_state()
+
+    def record_probe(self, host, alive, now):
+        """
+        PC起動確認の結果を記録
+
+        Args:
+            host: ホスト識別子（MACアドレス）
+            alive: PC起動中ならTrue
+            now: 確認時刻（datetime）
+
+        Returns:
+            float: 今回計測した起動所要時間（秒）、計測しなかった場合はNone
+        """
+        entry = self.state["hosts"].get(host)
+        if entry is None or entry["pending_since"] is None:
+            return None
+
+        if self._pending_expired(entry, now):
+            # 起動しなかった、または別要因で起動したため計測を破棄
+            entry["pending_since"] = None
+            self._save_state()
+            return None
+
+        if not alive:
+            return None
+
+        sample = (now - datetime.fromisoformat(entry["pending_since"])).total_seconds()
+        entry["pending_since"] = None
+        entry["samples"] = (entry["samples"] + [round(sample, 1)])[-self.window:]
+        self._save_state()
+        return sample
+
+    def _pending_expired(self, entry, now):
+        pending_since = datetime.fromisoformat(entry["pending_since"])
+        return (now - pending_since).total_seconds() > self.max_pending_minutes * 60
+
+    def estimate(self, host):
+        """
+        起動所要時間の推定値（直近計測の高パーセンタイル）
+
+        Args:
+            host: ホスト識別子（MACアドレス）
+
+        Returns:
+            float: 推定起動所要時間（秒）、計測数が不足している場合はNone
+        """
+        entry = self.state["hosts"].get(host)
+        if entry is None or len(entry["samples"]) < self.min_samples:
+            return None
+
+        return percentile(sorted(entry["samples"]), self.percentile)
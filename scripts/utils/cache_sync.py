@@ -0,0 +1,181 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+
+# 差分判定に使う予約フィールド（送信済みフラグは対象外）
+RESERVE_FIELDS = ("program_name", "start_time", "end_time")
+
+# 受信する差分メッセージの最大サイズ（バイト）
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+def diff_reserves(old_reserves, new_reserves):
+    """
+    予約情報の差分を計算
+
+    Args:
+        old_reserves: 更新前の予約情報リスト
+        new_reserves: 更新後の予約情報リスト
+
+    Returns:
+        dict: 差分（added: 追加された予約, removed: 削除された予約ID, changed: 変更された予約）
+    """
+    old_index = {str(r.get("id")): r for r in old_reserves}
+    new_ids = set()
+    added = []
+    changed = []
+
+    for reserve in new_reserves:
+        reserve_id = str(reserve.get("id"))
+        new_ids.add(reserve_id)
+        old = old_index.get(reserve_id)
+        if old is None:
+            added.append(reserve)
+        elif any(old.get(field) != reserve.get(field) for field in RESERVE_FIELDS):
+            changed.append(reserve)
+
+    removed = [reserve_id for reserve_id in old_index if reserve_id not in new_ids]
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def apply_reserve_diff(cache_data, diff):
+    """
+    キャッシュデータに予約情報の差分を適用
+
+    開始時刻が変わっていない予約は送信済みフラグを引き継ぐ
+
+    Args:
+        cache_data: キャッシュデータ（直接更新される）
+        diff: diff_reserves() の差分（last_updated を含む場合は更新時刻も反映）
+    """
+    index = {str(r.get("id")): r for r in cache_data.get("reserves", [])}
+
+    for reserve_id in diff.get("removed", []):
+        index.pop(str(reserve_id), None)
+
+    for reserve in diff.get("added", []) + diff.get("changed", []):
+        reserve_id = str(reserve.get("id"))
+        old = index.get(reserve_id)
+        reserve = dict(reserve)
+        if old is not None and old.get("start_time") == reserve.get("start_time"):
+            reserve["wol_sent_first"] = old.get("wol_sent_first", False)
+            reserve["wol_sent_second"] = old.get("wol_sent_second", False)
+        index[reserve_id] = reserve
+
+    cache_data["reserves"] = sorted(index.values(), key=lambda r: r.get("start_time", ""))
+    if diff.get("last_updated"):
+        cache_data["last_updated"] = diff["last_updated"]
+
+
+def push_reserve_diff(socket_path, diff, timeout=1.0):
+    """
+    常駐中のWOLチェッカーへ予約情報の差分を送信
+
+    Args:
+        socket_path: UNIXドメインソケットのパス
+        diff: 送信する差分
+        timeout: タイムアウト（秒）
+
+    Returns:
+        bool: チェッカーが差分を適用できたらTrue
+
+    Raises:
+        OSError: 接続・送信に失敗した場合
+    """
+    message = json.dumps(diff, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(message.encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        response = sock.makefile("rb").readline()
+    finally:
+        sock.close()
+
+    return response.strip() == b"ok"
+
+
+def _is_listening(socket_path):
+    """ソケットファイルで受信中のプロセスがあるか確認"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(1.0)
+        sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class _DiffRequestHandler(socketserver.StreamRequestHandler):
+    """差分メッセージ（JSON 1行）を受信して適用"""
+
+    def handle(self):
+        line = self.rfile.readline(MAX_MESSAGE_BYTES)
+        try:
+            diff = json.loads(line)
+            applied = bool(self.server.on_diff(diff))
+        except Exception:
+            applied = False
+        try:
+            self.wfile.write(b"ok\n" if applied else b"ng\n")
+        except OSError:
+            # 送信側がタイムアウト等で切断済みの場合は応答しない
+            pass
+
+
+class CacheSyncServer:
+    """予約情報の差分を受信するUNIXドメインソケットサーバー"""
+
+    def __init__(self, socket_path, on_diff):
+        """
+        初期化
+
+        Args:
+            socket_path: UNIXドメインソケットのパス
+            on_diff: 差分を受け取り適用結果（bool）を返す関数
+        """
+        self.socket_path = socket_path
+        self.on_diff = on_diff
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """
+        バックグラウンドスレッドで受信を開始
+
+        Raises:
+            OSError: 他のプロセスが同じソケットで受信中の場合など
+        """
+        if os.path.exists(self.socket_path):
+            if _is_listening(self.socket_path):
+                raise OSError(f"他のプロセスが受信中です: {self.socket_path}")
+            # 前回の異常終了で残ったソケットファイルを削除
+            os.remove(self.socket_path)
+        socket_dir = os.path.dirname(self.socket_path)
+        if socket_dir:
+            os.makedirs(socket_dir, exist_ok=True)
+
+        self._server = socketserver.UnixStreamServer(self.socket_path, _DiffRequestHandler)
+        self._server.on_diff = self.on_diff
+        os.chmod(self.socket_path, 0o660)
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="cache-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """受信を停止してソケットファイルを削除"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
@@ -0,0 +1,173 @@
+import glob
+import json
+import os
+import time
+from datetime import datetime
+
+
+class RunHistory:
+    """実行履歴ジャーナル（JSON Lines形式・追記専用）"""
+
+    def __init__(self, history_dir, name, max_segment_bytes=1048576, max_segments=50):
+        """
+        実行履歴ジャーナル初期化
+
+        Args:
+            history_dir: ジャーナル保存ディレクトリ
+            name: ジャーナル名（"wol" or "update"）
+            max_segment_bytes: 1セグメントの最大サイズ（バイト）
+            max_segments: 保持するローテーション済みセグメント数
+        """
+        self.history_dir = history_dir
+        self.name = name
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self.active_path = os.path.join(history_dir, f"{name}.jsonl")
+
+    def append(self, record):
+        """
+        レコードを1行追記
+
+        Args:
+            record: 記録する辞書（"ts" がない場合は現在時刻を付与）
+        """
+        # "ts" を先頭キーにして読み出し時の日時フィルタを高速化する
+        record = {"ts": record.get("ts") or datetime.now().isoformat(timespec="seconds"), **record}
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+        os.makedirs(self.history_dir, exist_ok=True)
+        self._rollover_if_needed()
+
+        # 1行を1回のwriteで追記（O_APPENDにより他プロセスの追記と混ざらない）
+        fd = os.open(self.active_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def _rollover_if_needed(self):
+        """アクティブセグメントがサイズ上限を超えていればローテーション"""
+        try:
+            size = os.path.getsize(self.active_path)
+        except OSError:
+            return
+
+        if size < self.max_segment_bytes:
+            return
+
+        stamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        os.replace(self.active_path, os.path.join(self.history_dir, f"{self.name}.{stamp}.jsonl"))
+
+        # 古いセグメントを削除
+        segments = self._rotated_segments()
+        for path in segments[:max(0, len(segments) - self.max_segments)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _rotated_segments(self):
+        """ローテーション済みセグメント一覧（古い順）"""
+        return sorted(glob.glob(os.path.join(self.history_dir, f"{self.name}.*.jsonl")))
+
+    def read(self, since=None):
+        """
+        レコードを古い順に読み出し
+
+        Args:
+            since: この日時以降のレコードのみ返す（datetime、Noneなら全件）
+
+        Yields:
+            dict: 記録レコード
+        """
+        since_str = since.isoformat(timespec="seconds") if since else None
+
+        for path in self._rotated_segments() + [self.active_path]:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        # 行頭の {"ts":"... を文字列比較してJSON解析前に除外
+                        if since_str and line[7:7 + len(since_str)] < since_str:
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if since_str and record.get("ts", "") < since_str:
+                            continue
+                        yield record
+            except FileNotFoundError:
+                continue
+
+
+def new_record():
+    """
+    実行履歴レコードを生成（全ジャーナル共通のスキーマ）
+
+    Returns:
+        dict: 初期値を設定したレコード
+    """
+    return {
+        "status": None,
+        "durations_ms": {},
+        "pc_alive": None,
+        "reserve_count": None,
+        "wol_sent": False,
+        "reserve_id": None
+    }
+
+
+def append_record(history, record, logger):
+    """
+    実行履歴ジャーナルにレコードを追記（失敗しても処理は継続）
+
+    Args:
+        history: 実行履歴ジャーナル（Noneの場合は記録しない）
+        record: 実行履歴レコード
+        logger: ロガー
+    """
+    if history is None:
+        return
+
+    try:
+        history.append(record)
+    except Exception as e:
+        logger.warning(f"実行履歴の記録に失敗: {e}")
+
+
+def elapsed_ms(started):
+    """
+    経過時間をミリ秒で返す
+
+    Args:
+        started: time.monotonic() の計測開始値
+
+    Returns:
+        float: 経過時間（ミリ秒、小数第1位まで）
+    """
+    return round((time.monotonic() - started) * 1000, 1)
+
+
+def create_history(config, log_dir, name):
+    """
+    設定から実行履歴ジャーナルを生成
+
+    Args:
+        config: 設定データ
+        log_dir: ログディレクトリ（history.dir 未指定時の基準）
+        name: ジャーナル名
+
+    Returns:
+        RunHistory: ジャーナル、無効化されている場合はNone
+    """
+    history_config = config.get("history", {})
+    if not history_config.get("enabled", True):
+        return None
+
+    history_dir = os.path.expanduser(history_config.get("dir", os.path.join(log_dir, "history")))
+    return RunHistory(
+        history_dir,
+        name,
+        max_segment_bytes=history_config.get("max_segment_bytes", 1048576),
+        max_segments=history_config.get("max_segments", 50)
+    )
@@ -3,30 +3,48 @@ import socket
 import platform
 
 
+# 近隣テーブルの状態ごとの判定（ここにない状態は判断不可としてアクティブな確認へ）
+NEIGHBOR_STATES = {
+    "REACHABLE": True,
+    "FAILED": False
+}
+
+
 class PCMonitor:
     """PC状態監視ユーティリティ"""
 
-    def __init__(self, ip_address, timeout=3):
+    def __init__(self, ip_address, timeout=3, mac_address=None, neighbor_fallback="ping"):
         """
         PC監視初期化
 
         Args:
             ip_address: PCのIPアドレス
             timeout: タイムアウト（秒）
+            mac_address: PCのMACアドレス（近隣テーブルの照合に使用）
+            neighbor_fallback: 近隣テーブルで判断できない場合の確認方法 ("ping" or "port")
         """
         self.ip_address = ip_address
         self.timeout = timeout
+        self.mac_address = mac_address
+        self.neighbor_fallback = neighbor_fallback
 
     def is_pc_alive(self, method="ping"):
         """
         PCが起動しているか確認
 
         Args:
-            method: 確認方法 ("ping" or "port")
+            method: 確認方法 ("ping", "port" or "neighbor")
 
         Returns:
             bool: PC起動中ならTrue
         """
+        if method == "neighbor":
+            # 近隣テーブルで判断できればパケットを送らずに結果を返す
+            alive = self._check_neighbor()
+            if alive is not None:
+                return alive
+            method = self.neighbor_fallback
+
         if method == "ping":
             return self._check_ping()
         elif method == "port":
@@ -53,6 +71,43 @@ class PCMonitor:
         except (subprocess.TimeoutExpired, Exception):
             return False
 
+    def _check_neighbor(self):
+        """
+        カーネルの近隣テーブル（ARPキャッシュ）でPC起動確認（パケット送信なし）
+
+        Returns:
+            bool: REACHABLEならTrue、FAILEDならFalse、判断できない場合はNone
+        """
+        if platform.system() != "Linux":
+            return None
+
+        try:
+            result = subprocess.run(
+                ["ip", "-4", "neigh", "show", "to", self.ip_address],
+                capture_output=True,
+                timeout=self.timeout
+            )
+        except (subprocess.TimeoutExpired, Exception):
+            return None
+        if result.returncode != 0:
+            return None
+
+        # 例: "192.168.1.100 dev eth0 lladdr aa:bb:cc:dd:ee:ff REACHABLE"
+        for line in result.stdout.decode(errors="replace").splitlines():
+            fields = line.split()
+            if not fields or fields[0] != self.ip_address:
+                continue
+
+            # IPアドレスが別の機器に割り当てられている場合は判断しない
+            if "lladdr" in fields and self.mac_address:
+                lladdr = fields[fields.index("lladdr") + 1]
+                if _normalize_mac(lladdr) != _normalize_mac(self.mac_address):
+                    return None
+
+            return NEIGHBOR_STATES.get(fields[-1])
+
+        return None
+
     def _check_port(self, port=8888):
         """ポート接続でPC起動確認"""
         try:
@@ -63,3 +118,8 @@ class PCMonitor:
             return result == 0
         except Exception:
             return False
+
+
+def _normalize_mac(mac_address):
+    """MACアドレスを比較用に正規化（区切り文字除去・小文字化）"""
+    return mac_address.replace(":", "").replace("-", "").lower()
@@ -0,0 +1,18 @@
+import math
+
+
+def percentile(values, pct):
+    """
+    パーセンタイル値を計算（nearest-rank法）
+
+    Args:
+        values: ソート済みの数値リスト
+        pct: パーセンタイル（0-100）
+
+    Returns:
+        float: パーセンタイル値、値がない場合はNone
+    """
+    if not values:
+        return None
+    rank = max(1, math.ceil(len(values) * pct / 100))
+    return values[rank - 1]
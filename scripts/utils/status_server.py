@@ -0,0 +1,58 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class _StatusRequestHandler(BaseHTTPRequestHandler):
+    """状態取得リクエスト（GET）に応答"""
+
+    def do_GET(self):
+        if self.path not in ("/", "/status"):
+            self.send_error(404)
+            return
+
+        body = self.server.get_body()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # ダッシュボードからのポーリングでログが埋まらないよう出力しない
+        pass
+
+
+class StatusServer:
+    """読み取り専用の状態取得HTTPサーバー"""
+
+    def __init__(self, host, port, get_body):
+        """
+        初期化
+
+        Args:
+            host: 待ち受けアドレス（通常は 127.0.0.1）
+            port: 待ち受けポート
+            get_body: 応答本文（JSONのバイト列）を返す関数
+        """
+        self.host = host
+        self.port = port
+        self.get_body = get_body
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """バックグラウンドスレッドで待ち受けを開始"""
+        self._server = HTTPServer((self.host, self.port), _StatusRequestHandler)
+        self._server.get_body = self.get_body
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="status", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """待ち受けを停止"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None